@@ -1,9 +1,32 @@
+import functools
+from dataclasses import dataclass
+
 import numpy as np
 
 from error_correction.error_correction_type import ErrorCorrectionType
 from error_correction.generic_error_correction import GenericErrorCorrection
 
 
+@dataclass(frozen=True)
+class HammingTables:
+    """Lookup tables for a Hamming code with a given number of redundant bits
+
+    Codewords are packed into uint16 values (one codeword per 16 bit lane), with the first bit of the
+    codeword as most significant bit, matching the order of the bits in the encoded bytes.
+    * `number_of_data_and_redundant_bits` is the size of a codeword for 8 data bits
+    * `parity_check_masks` marks the positions checked by each redundant bit in a packed codeword
+    * `data_positions` and `parity_positions` are the indices of the data and redundant bits in a codeword
+    * `bit_values` is the value of each position in a packed codeword
+    * `syndrome_values` is the value of each bit when reading an error syndrome as binary number
+    """
+    number_of_data_and_redundant_bits: int
+    parity_check_masks: np.ndarray
+    data_positions: np.ndarray
+    parity_positions: np.ndarray
+    bit_values: np.ndarray
+    syndrome_values: np.ndarray
+
+
 class HammingErrorCorrection(GenericErrorCorrection):
 
     def __init__(self):
@@ -14,261 +37,175 @@ class HammingErrorCorrection(GenericErrorCorrection):
 
         redundant_bits = 4
 
-        hamming_code = []
-
-        data_as_bits = HammingErrorCorrection.__return_as_bits(data[::-1])
-
-        number_of_data_and_redundant_bits = 8 + redundant_bits
-
-        while len(data_as_bits) > 0:
-            next_bits = data_as_bits[-8:]
-
-            hamming_code_with_placeholders = \
-                HammingErrorCorrection.__add_placeholder_redundant_bits(next_bits, number_of_data_and_redundant_bits)
+        tables = HammingErrorCorrection.__get_tables(redundant_bits)
 
-            hamming_code_calculated = \
-                HammingErrorCorrection.__calculate_values_for_redundant_bits(redundant_bits,
-                                                                             number_of_data_and_redundant_bits,
-                                                                             hamming_code_with_placeholders)
+        codeword_table = HammingErrorCorrection.__get_codeword_table(redundant_bits)
 
-            hamming_code.extend(hamming_code_calculated)
+        # Each byte is encoded independently, so the codewords for all bytes can be looked up at once
+        hamming_code = codeword_table[np.frombuffer(data, dtype=np.uint8)]
 
-            data_as_bits = data_as_bits[:-8]
-
-        return b''.join(HammingErrorCorrection.__convert_bits_to_bytes(hamming_code))
+        return HammingErrorCorrection.__convert_codewords_to_bytes(hamming_code, tables)
 
     @staticmethod
     def decode(decoded_data: bytes, redundant_bits: int) -> bytes:
 
         redundant_bits = 4
 
-        corrected_data = []
-
-        hamming_code_as_bits = HammingErrorCorrection.__return_as_bits(decoded_data)
-
-        hamming_code_as_bits = HammingErrorCorrection.__add_lost_bits(hamming_code_as_bits)
-
-        number_of_data_and_redundant_bits = 8 + redundant_bits
-
-        while len(hamming_code_as_bits) > 0:
-            next_hamming_bits = hamming_code_as_bits[:number_of_data_and_redundant_bits]
-
-            number_of_iterations, error_syndrome = 0, []
-
-            while number_of_iterations < redundant_bits:
-                position_of_next_redundant_bit = 2 ** number_of_iterations
-
-                sum_of_bit_values = HammingErrorCorrection.__calculate_sum_of_bit_values(
-                    number_of_data_and_redundant_bits,
-                    position_of_next_redundant_bit,
-                    next_hamming_bits)
+        tables = HammingErrorCorrection.__get_tables(redundant_bits)
+        number_of_data_and_redundant_bits = tables.number_of_data_and_redundant_bits
 
-                error_syndrome.extend([sum_of_bit_values % 2])
+        codewords = HammingErrorCorrection.__split_into_codewords(decoded_data, tables)
 
-                number_of_iterations += 1
+        error_syndromes = HammingErrorCorrection.__calculate_error_syndromes(codewords, tables)
 
-            # Check if a bit is flipped
-            sum_of_parity_bit_values, number_of_iterations, position_of_flipped_bit = 0, 0, 0
+        # Read each error syndrome as binary number to get the position of the flipped bit.
+        # Subtract one to get the correct position in the array
+        positions_of_flipped_bits = error_syndromes @ tables.syndrome_values - 1
 
-            for value in error_syndrome:
-                sum_of_parity_bit_values += value
-                if value == 1:
-                    position_of_flipped_bit += 2 ** number_of_iterations
-                number_of_iterations += 1
+        has_flipped_bit = positions_of_flipped_bits >= 0
+        is_correctable = has_flipped_bit & (positions_of_flipped_bits < number_of_data_and_redundant_bits)
 
-            position_of_flipped_bit -= 1  # Subtract one to get the correct position in the array
+        if np.any(has_flipped_bit & ~is_correctable):
+            print("More than one flipped bit (error) found! Could not correct any bits")
 
-            if position_of_flipped_bit < 0:
-                position_of_flipped_bit = 0
+        # Correct the flipped bit if there is one by xor-ing with a mask instead of branching on its value
+        positions_of_flipped_bits = np.clip(positions_of_flipped_bits, 0, number_of_data_and_redundant_bits - 1)
+        flipped_bits = np.where(is_correctable, tables.bit_values[positions_of_flipped_bits], 0)
 
-            # Correct the flipped bit if there is one
-            if sum_of_parity_bit_values != 0:
-                if position_of_flipped_bit >= 12:
-                    print("More than one flipped bit (error) found! Could not correct any bits")
-                else:
-                    if next_hamming_bits[position_of_flipped_bit] == 0:
-                        next_hamming_bits[position_of_flipped_bit] = 1
-                    else:
-                        next_hamming_bits[position_of_flipped_bit] = 0
+        codewords ^= flipped_bits
 
-            corrected_data.extend(next_hamming_bits)
+        # Previously the corrected codewords were converted to bytes and split into codewords again before
+        # removing the redundant bits, which drops an empty last codeword a second time if the codewords
+        # fill whole bytes. This is kept so that messages are decoded exactly as before.
+        if len(codewords) > 1 and len(codewords) * number_of_data_and_redundant_bits % 8 == 0 and codewords[-1] == 0:
+            codewords = codewords[:-1]
 
-            hamming_code_as_bits = hamming_code_as_bits[number_of_data_and_redundant_bits:]
+        data_table = HammingErrorCorrection.__get_data_table(redundant_bits)
 
-            if HammingErrorCorrection.__ignore_remaining_bits(hamming_code_as_bits, number_of_data_and_redundant_bits):
-                break
-
-        corrected_data_as_byte_string = b''.join(HammingErrorCorrection.__convert_bits_to_bytes(corrected_data))
-
-        corrected_decoded_data =\
-            HammingErrorCorrection.__correct_errors(corrected_data_as_byte_string, redundant_bits)
-
-        return corrected_decoded_data
+        return data_table[codewords].tobytes()
 
     @staticmethod
-    def __correct_errors(data: bytes, redundant_bits: int) -> bytes:
+    def __split_into_codewords(data: bytes, tables: HammingTables) -> np.ndarray:
 
-        decoded_hamming_code = []
+        number_of_data_and_redundant_bits = tables.number_of_data_and_redundant_bits
 
         data_as_bits = HammingErrorCorrection.__return_as_bits(data)
 
-        data_as_bits = HammingErrorCorrection.__add_lost_bits(data_as_bits)
-
-        number_of_data_and_redundant_bits = 8 + redundant_bits
+        number_of_lost_bits = -len(data_as_bits) % number_of_data_and_redundant_bits
 
-        while len(data_as_bits) > 0:
-            next_hamming_bits = data_as_bits[:number_of_data_and_redundant_bits]
+        data_as_bits = np.pad(data_as_bits, (0, number_of_lost_bits))
 
-            cleaned_hamming_bits = HammingErrorCorrection.__remove_all_redundant_bits(next_hamming_bits, redundant_bits)
+        codewords = data_as_bits.reshape(-1, number_of_data_and_redundant_bits) @ tables.bit_values
 
-            decoded_hamming_code.extend(cleaned_hamming_bits)
+        # The last block only consists of padding if it is empty
+        if len(codewords) > 1 and codewords[-1] == 0:
+            codewords = codewords[:-1]
 
-            data_as_bits = data_as_bits[number_of_data_and_redundant_bits:]
-
-            if HammingErrorCorrection.__ignore_remaining_bits(data_as_bits, number_of_data_and_redundant_bits):
-                break
-
-        return b''.join(HammingErrorCorrection.__convert_bits_to_bytes(decoded_hamming_code))
+        return codewords
 
     @staticmethod
-    def __add_placeholder_redundant_bits(data_as_bits: list, number_of_data_and_redundant_bits: int) -> list:
+    def __convert_codewords_to_bytes(codewords: np.ndarray, tables: HammingTables) -> bytes:
 
-        j, k, hamming_code_with_placeholders = 0, 0, []
+        hamming_code = (codewords[:, np.newaxis] & tables.bit_values) != 0
 
-        for i in range(0, number_of_data_and_redundant_bits):
-            position_of_next_redundant_bit = 2 ** j
+        return HammingErrorCorrection.__convert_bits_to_bytes(hamming_code.reshape(-1))
 
-            if position_of_next_redundant_bit == i + 1:
-                hamming_code_with_placeholders.append(0)
-                j += 1
-            else:
-                hamming_code_with_placeholders.append(int(data_as_bits[k]))
-                k += 1
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def __get_tables(redundant_bits: int) -> HammingTables:
+        """Return the lookup tables for the given number of redundant bits, computed only once"""
 
-            i += 1
+        number_of_data_and_redundant_bits = 8 + redundant_bits
 
-        return hamming_code_with_placeholders
+        assert number_of_data_and_redundant_bits <= 16, "Codewords have to fit into 16 bits"
 
-    @staticmethod
-    def __calculate_sum_of_bit_values(number_of_data_and_redundant_bits: int, position_of_next_redundant_bit: int,
-                                      hamming_code: list) -> int:
+        # The redundant bits are at the positions 2**i (1-indexed), all other positions hold data
+        positions = np.arange(number_of_data_and_redundant_bits)
+        parity_positions = 2 ** np.arange(redundant_bits) - 1
+        data_positions = np.setdiff1d(positions, parity_positions)
 
-        sum_of_bit_values = 0
-        j = position_of_next_redundant_bit - 1
+        bit_values = np.left_shift(1, number_of_data_and_redundant_bits - 1 - positions).astype(np.uint16)
+        syndrome_values = 1 << np.arange(redundant_bits)
 
-        # Check all relevant bits in the array for their value
+        # Mask i marks all positions which are checked by the redundant bit at position 2**i, these are
+        # all positions which have the i-th bit set (1-indexed).
         # https://users.cis.fiu.edu/~downeyt/cop3402/hamming.html
-        while j < number_of_data_and_redundant_bits:
-            for i in range(position_of_next_redundant_bit):
-                sum_of_bit_values += hamming_code[j]
-                j += 1
-                if j >= number_of_data_and_redundant_bits:
-                    break
+        parity_check_matrix = ((positions + 1) >> np.arange(redundant_bits)[:, np.newaxis]) & 1
+        parity_check_masks = parity_check_matrix.astype(np.uint16) @ bit_values
 
-            j += position_of_next_redundant_bit
+        for table in (parity_check_masks, data_positions, parity_positions, bit_values, syndrome_values):
+            table.setflags(write=False)
 
-        return sum_of_bit_values
+        return HammingTables(number_of_data_and_redundant_bits, parity_check_masks, data_positions,
+                             parity_positions, bit_values, syndrome_values)
 
     @staticmethod
-    def __calculate_values_for_redundant_bits(redundant_bits: int, number_of_data_and_redundant_bits: int,
-                                              hamming_code: list) -> list:
+    @functools.lru_cache(maxsize=None)
+    def __get_codeword_table(redundant_bits: int) -> np.ndarray:
+        """Return the packed codeword for each of the 256 possible byte values, computed only once"""
 
-        number_of_iterations = 0
+        tables = HammingErrorCorrection.__get_tables(redundant_bits)
 
-        while number_of_iterations < redundant_bits:
-            position_of_next_redundant_bit = 2 ** number_of_iterations
+        # One row with the 8 data bits of each possible byte value
+        data_as_bits = HammingErrorCorrection.__return_as_bits(bytes(range(256))).reshape(-1, 8)
 
-            sum_of_bit_values = HammingErrorCorrection.__calculate_sum_of_bit_values(number_of_data_and_redundant_bits,
-                                                                                     position_of_next_redundant_bit,
-                                                                                     hamming_code)
+        codewords = HammingErrorCorrection.__add_placeholder_redundant_bits(data_as_bits, tables)
 
-            # Check if all relevant bits have an even number of 1's
-            # If not, update redundant bit value for even parity
-            if sum_of_bit_values % 2 != 0:
-                hamming_code[position_of_next_redundant_bit - 1] = 1
+        codeword_table = HammingErrorCorrection.__calculate_values_for_redundant_bits(codewords, tables)
 
-            number_of_iterations += 1
+        codeword_table.setflags(write=False)
 
-        return hamming_code
+        return codeword_table
 
     @staticmethod
-    def __get_bytes(bits: iter) -> bytes:
-
-        done = False
-        while not done:
-            byte = 0
-            for _ in range(0, 8):
-                try:
-                    bit = next(bits)
-                except StopIteration:
-                    bit = 0
-                    done = True
-                byte = (byte << 1) | bit
-            yield byte
+    @functools.lru_cache(maxsize=None)
+    def __get_data_table(redundant_bits: int) -> np.ndarray:
+        """Return the data byte for each possible packed codeword, computed only once"""
 
-    @staticmethod
-    def __convert_bits_to_bytes(hamming_code: list) -> list:
+        tables = HammingErrorCorrection.__get_tables(redundant_bits)
 
-        byte_array, number_of_iterations = [], 0
+        codewords = np.arange(2 ** tables.number_of_data_and_redundant_bits, dtype=np.uint16)
 
-        for b in HammingErrorCorrection.__get_bytes(iter(hamming_code)):
-            number_of_iterations += 1
-            byte_array.append(bytes([b]))
+        data_as_bits = (codewords[:, np.newaxis] & tables.bit_values[tables.data_positions]) != 0
 
-        number_of_bytes = len(hamming_code) / 8
+        data_table = np.packbits(data_as_bits, axis=1).reshape(-1)
 
-        # Remove possible empty byte that can occur
-        if number_of_bytes + 1 == number_of_iterations:
-            byte_array = byte_array[:-1]
+        data_table.setflags(write=False)
 
-        return byte_array
+        return data_table
 
     @staticmethod
-    def __remove_all_redundant_bits(list_of_hamming_bits: list, redundant_bits: int) -> list:
-
-        number_of_iterations = 0
+    def __add_placeholder_redundant_bits(data_as_bits: np.ndarray, tables: HammingTables) -> np.ndarray:
 
-        while number_of_iterations < redundant_bits:
-            position_of_next_redundant_bit = 2 ** number_of_iterations - 1 - number_of_iterations
+        hamming_code_with_placeholders = np.zeros((len(data_as_bits), tables.number_of_data_and_redundant_bits),
+                                                  dtype=np.uint8)
 
-            if position_of_next_redundant_bit < len(list_of_hamming_bits):
-                del list_of_hamming_bits[position_of_next_redundant_bit]
-            else:
-                break
+        hamming_code_with_placeholders[:, tables.data_positions] = data_as_bits
 
-            number_of_iterations += 1
-
-        return list_of_hamming_bits
+        return hamming_code_with_placeholders @ tables.bit_values
 
     @staticmethod
-    def __ignore_remaining_bits(decoded_hamming_code: list, number_of_data_and_redundant_bits: int) -> bool:
-
-        if len(decoded_hamming_code) <= number_of_data_and_redundant_bits:
+    def __calculate_error_syndromes(codewords: np.ndarray, tables: HammingTables) -> np.ndarray:
 
-            bit_sum = 0
+        # The parity of all bits checked by a redundant bit is the parity of the number of set bits in the
+        # masked codeword. With one codeword per uint16 lane all codewords are checked at once
+        return np.bitwise_count(codewords[:, np.newaxis] & tables.parity_check_masks) & 1
 
-            for bit in decoded_hamming_code:
-                bit_sum += bit
+    @staticmethod
+    def __calculate_values_for_redundant_bits(codewords: np.ndarray, tables: HammingTables) -> np.ndarray:
 
-            if bit_sum == 0:
-                return True
+        # As the redundant bits are still 0, the syndromes are the values needed for even parity
+        error_syndromes = HammingErrorCorrection.__calculate_error_syndromes(codewords, tables)
 
-        return False
+        return codewords | (error_syndromes @ tables.bit_values[tables.parity_positions])
 
     @staticmethod
-    def __return_as_bits(data: bytes) -> list:
-
-        data_as_bits = []
+    def __convert_bits_to_bytes(hamming_code: np.ndarray) -> bytes:
 
-        for value in data:
-            data_as_bits.extend([int(i) for i in str(np.binary_repr(value, 8))])
-
-        return data_as_bits
+        # packbits pads the last byte with zeros if the number of bits is not divisible by 8
+        return np.packbits(hamming_code).tobytes()
 
     @staticmethod
-    def __add_lost_bits(data: list) -> list:
-
-        while len(data) % 12 != 0:
-            data.extend([0])
+    def __return_as_bits(data: bytes) -> np.ndarray:
 
-        return data
+        return np.unpackbits(np.frombuffer(data, dtype=np.uint8))
@@ -23,14 +23,19 @@ class EncryptionProvider:
             is_test: Optional[bool] = False,
             salt: Optional[bytes] = None,
             nonce: Optional[bytes] = None,
+            hash_iterations: Optional[int] = None,
     ) -> GenericEncryptor:
-        """Return encryptor with given type, nonce will only be used if AES"""
+        """Return encryptor with given type, nonce will only be used if AES
 
-        hash_algo = HashProvider.get_hash(hash_type, is_test, salt)
+        hash_iterations will only be used if PBKDF2, if None the default number of iterations is used.
+        """
 
+        # Return before creating the hash, as no key is needed without encryption
         if not encryption_type or encryption_type == EncryptionType.NONE:
             return NoneEncryptor()
 
+        hash_algo = HashProvider.get_hash(hash_type, is_test, salt, hash_iterations)
+
         if encryption_type == EncryptionType.FERNET:
             return FernetEncryptor(hash_algo, decryption)
 
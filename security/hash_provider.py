@@ -13,12 +13,19 @@ class HashProvider:
         pass
 
     @staticmethod
-    def get_hash(hash_type: HashType, is_test: Optional[bool] = False, salt: Optional[bytes] = None) -> GenericHash:
+    def get_hash(
+            hash_type: HashType,
+            is_test: Optional[bool] = False,
+            salt: Optional[bytes] = None,
+            iterations: Optional[int] = None,
+    ) -> GenericHash:
+        """Return hash with given type, iterations will only be used if PBKDF2 (None for the default)"""
+
         if not hash_type or hash_type == HashType.NONE:
             return NoneHash()
 
         if hash_type == HashType.PBKDF2:
-            return Pbkdf2Hash(is_test, salt)
+            return Pbkdf2Hash(is_test, salt, iterations)
 
         if hash_type == HashType.SCRYPT:
             return ScryptHash(is_test, salt)
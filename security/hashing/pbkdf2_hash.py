@@ -1,3 +1,7 @@
+import hashlib
+
+from typing import Optional
+
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
@@ -14,12 +18,31 @@ class Pbkdf2Hash(SaltedHash):
     HASH_LENGTH = 32
     HASH_ITERATIONS = 100000
 
+    def __init__(self, is_test: Optional[bool] = False, salt: Optional[bytes] = None,
+                 iterations: Optional[int] = None):
+        super().__init__(is_test, salt)
+
+        # Keys can only be derived again with the same number of iterations, so change with care
+        self._iterations = Pbkdf2Hash.HASH_ITERATIONS if iterations is None else iterations
+
     def _get_kdf_instance(self):
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=Pbkdf2Hash.HASH_LENGTH,
             salt=self._salt,
-            iterations=Pbkdf2Hash.HASH_ITERATIONS,
+            iterations=self._iterations,
         )
 
         return kdf
+
+    def _derive_key(self, password_bytes: bytes) -> bytes:
+        # hashlib uses the OpenSSL implementation directly and derives the same key as the kdf instance
+        key = hashlib.pbkdf2_hmac(
+            'sha256',
+            password_bytes,
+            self._salt,
+            self._iterations,
+            Pbkdf2Hash.HASH_LENGTH,
+        )
+
+        return key
@@ -51,9 +51,6 @@ class SaltedHash(GenericHash):
         kdf = self._get_kdf_instance()
         key = kdf.derive(password_bytes)
 
-        kdf = self._get_kdf_instance()
-        kdf.verify(password_bytes, key)
-
         return key
 
     @abstractmethod
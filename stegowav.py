@@ -3,6 +3,7 @@
 import argparse
 from pathlib import Path
 import cProfile
+import pstats
 
 from error_correction.error_correction_provider import ErrorCorrectionProvider
 from error_correction.error_correction_type import ErrorCorrectionType
@@ -50,6 +51,9 @@ def parse_arguments() -> argparse.Namespace:
 
     parser.add_argument("--profile", action="store_true", help="profile code (show which parts are taking long)")
 
+    parser.add_argument("--profile_output", type=str,
+                        help="file path to write the profile to (e.g. for snakeviz), implies --profile")
+
     parser.add_argument("-s", "--spectrogram", action="store_true", help="display a spectrogram of the given file")
 
     parser.add_argument("-p", "--play", action="store_true",
@@ -137,10 +141,14 @@ def handle_args(args):
 
 def main():
     args = parse_arguments()
-    if args.profile:
+    if args.profile or args.profile_output:
         with cProfile.Profile() as pr:
             handle_args(args)
-        pr.print_stats()
+        stats = pstats.Stats(pr).sort_stats(pstats.SortKey.CUMULATIVE)
+        stats.print_stats(30)
+        if args.profile_output:
+            stats.dump_stats(args.profile_output)
+            print(f"Profile written to {args.profile_output}!")
     else:
         handle_args(args)
 
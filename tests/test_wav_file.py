@@ -13,6 +13,7 @@ from security.encryptors.none_encryptor import NoneEncryptor
 from security.encryptors.rsa_encryptor import RsaEncryptor
 from security.enums.encryption_type import EncryptionType
 from security.enums.hash_type import HashType
+from security.hashing.pbkdf2_hash import Pbkdf2Hash
 from wav_steganography.wav_file import WAVFile
 
 audio_path = Path("audio")
@@ -30,6 +31,20 @@ def get_file_path(filename):
     return encoded_file_path
 
 
+def get_md5_checksum(file_path) -> str:
+    with open(file_path, 'rb') as file:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(file, 'md5').hexdigest()
+
+        # Python < 3.11, read the file in chunks into a reused buffer
+        md5 = hashlib.md5()
+        buffer = bytearray(2 ** 20)
+        view = memoryview(buffer)
+        while bytes_read := file.readinto(buffer):
+            md5.update(view[:bytes_read])
+        return md5.hexdigest()
+
+
 def test_loading_and_plotting_wav_file():
     for audio_file in audio_path.glob("*.wav"):
         print(f"Loading audio file {audio_file}")
@@ -41,14 +56,14 @@ def test_loading_and_plotting_wav_file():
 
 def test_loading_and_writing_wav_file():
     for audio_file in audio_path.glob("*.wav"):
-        md5checksum = hashlib.md5(open(audio_file, 'rb').read()).hexdigest()
+        md5checksum = get_md5_checksum(audio_file)
         print(f"Loading audio file {audio_file}")
         file = WAVFile(audio_file)
         written_path = audio_path / 'copied'
         written_path.mkdir(exist_ok=True)
         copied_file_path = written_path / audio_file.name
         file.write(copied_file_path, overwrite=True)
-        copied_md5checksum = hashlib.md5(open(copied_file_path, 'rb').read()).hexdigest()
+        copied_md5checksum = get_md5_checksum(copied_file_path)
         assert md5checksum == copied_md5checksum, "Checksums mismatch!"
 
 
@@ -107,10 +122,41 @@ def test_multiple_encoding_decoding_with_error_correction():
                 decoded_data == data, "Decoded and corrected message is not the same as the encoded one!"
 
 
+def flip_bit(data: bytes, bit_index: int) -> bytes:
+    flipped_data = bytearray(data)
+    flipped_data[bit_index // 8] ^= 0x80 >> (bit_index % 8)
+    return bytes(flipped_data)
+
+
+def test_hamming_error_correction_corrects_single_flipped_bit():
+    data = get_random_string(101).encode("UTF-8")
+    encoded_data = HammingErrorCorrection.encode(data, 4)
+
+    # Each byte is encoded as 12 bits, so flip one bit in every position of a random codeword
+    codeword_start = random.randrange(len(data)) * 12
+    for position in range(12):
+        corrupted_data = flip_bit(encoded_data, codeword_start + position)
+
+        assert HammingErrorCorrection.decode(corrupted_data, 4) == data, f"Flipped bit {position} not corrected!"
+
+
+def test_hamming_error_correction_leaves_two_flipped_bits_uncorrected():
+    data = get_random_string(101).encode("UTF-8")
+    encoded_data = HammingErrorCorrection.encode(data, 4)
+
+    # Flip the data bits at positions 6 and 11 (1-indexed) of the first codeword, which hold the 3rd and 7th
+    # bit of the first byte. The error syndrome 6 ^ 11 = 13 points outside the codeword, so nothing is corrected
+    corrupted_data = flip_bit(flip_bit(encoded_data, 5), 10)
+
+    assert HammingErrorCorrection.decode(corrupted_data, 4) == bytes([data[0] ^ 0b00100010]) + data[1:]
+
+
 def test_multiple_encoding_with_error_correction_and_encryption():
-    fernet_pbkdf2_encryptor = EncryptionProvider.get_encryptor(EncryptionType.FERNET, HashType.PBKDF2, is_test=True)
+    fernet_pbkdf2_encryptor = EncryptionProvider.get_encryptor(
+        EncryptionType.FERNET, HashType.PBKDF2, is_test=True, hash_iterations=1000)
     fernet_scrypt_encryptor = EncryptionProvider.get_encryptor(EncryptionType.FERNET, HashType.SCRYPT, is_test=True)
-    aes_pbkdf2_encryptor = EncryptionProvider.get_encryptor(EncryptionType.AES, HashType.PBKDF2, is_test=True)
+    aes_pbkdf2_encryptor = EncryptionProvider.get_encryptor(
+        EncryptionType.AES, HashType.PBKDF2, is_test=True, hash_iterations=1000)
     aes_scrypt_encryptor = EncryptionProvider.get_encryptor(EncryptionType.AES, HashType.SCRYPT, is_test=True)
     rsa_encryptor = EncryptionProvider.get_encryptor(EncryptionType.RSA, is_test=True)
 
@@ -133,6 +179,15 @@ def test_multiple_encoding_with_error_correction_and_encryption():
             file.encode(data, redundant_bits=8, encryptor=encryptor)
 
 
+def test_pbkdf2_key_matches_kdf_instance():
+    pbkdf2_hash = Pbkdf2Hash(is_test=True, iterations=1000)
+    password_bytes = get_random_string(20).encode("UTF-8")
+
+    key = pbkdf2_hash._derive_key(password_bytes)
+
+    pbkdf2_hash._get_kdf_instance().verify(password_bytes, key)
+
+
 def test_multiple_encoding_decoding_with_error_correction_and_oversized_data():
     with pytest.raises(ValueError):
         for audio_file in audio_path.glob("*.wav"):
@@ -1,4 +1,3 @@
-import textwrap
 from collections import OrderedDict
 from pathlib import Path
 import struct
@@ -72,8 +71,10 @@ class WAVFile:
             assert h["BlockAlign"] == h['NumChannels'] * h['BitsPerSample'] // 8
             assert h["ByteRate"] == h['SampleRate'] * h['NumChannels'] * h['BitsPerSample'] // 8
 
-            # Parse the actual data
-            self.data = np.array(struct.unpack(self._get_data_format(), wav_file.read(h['Subchunk2Size'])))
+            # Parse the actual data, directly from the buffer instead of creating an int object per amplitude
+            data_dtype, integer_count = self._get_data_dtype()
+            data_bytes = wav_file.read(h['Subchunk2Size'])
+            self.data = np.frombuffer(data_bytes, dtype=data_dtype, count=integer_count).astype(np.int64)
 
     def _data_as_channel_data_frame(self, data_arr: np.ndarray) -> pd.DataFrame:
         return pd.DataFrame(data={
@@ -81,13 +82,23 @@ class WAVFile:
             for i in range(0, self.header['NumChannels'])
         })
 
-    def _get_data_format(self) -> str:
-        """ Returns the data format string required for struct (e.g. "<88200h") """
+    def _get_data_layout(self) -> Tuple[str, int, str]:
+        """ Returns the endianness, integer count and struct integer type of the data (e.g. ("<", 88200, "h")) """
         endianness = ('<' if self.header["ChunkID"] == b"RIFF" else ">")
         integer_count = self.header['Subchunk2Size'] * 8 // self.header['BitsPerSample']
         integer_size = {8: 'b', 16: 'h', 32: 'i'}[self.header['BitsPerSample']]
+        return endianness, integer_count, integer_size
+
+    def _get_data_format(self) -> str:
+        """ Returns the data format string required for struct (e.g. "<88200h") """
+        endianness, integer_count, integer_size = self._get_data_layout()
         return f"{endianness}{integer_count}{integer_size}"
 
+    def _get_data_dtype(self) -> Tuple[np.dtype, int]:
+        """ Returns the numpy dtype matching the data format and the number of integers (e.g. ("<i2", 88200)) """
+        endianness, integer_count, integer_size = self._get_data_layout()
+        return np.dtype(f"{endianness}{integer_size}"), integer_count
+
     def write(self, filename: Union[Path, str], overwrite: bool = False):
         """ Create a WAVFile with given filename """
         if not overwrite and filename.exists():
@@ -223,9 +234,7 @@ class WAVFile:
         """ Encode a given chunk at the specified byte index """
         nth = chunk.every_nth_byte
 
-        binary_data = ''.join(map(lambda b: f"{b:08b}", chunk.data))  # e.g. "0010101011101100"
-        lsb_bits = textwrap.wrap(binary_data, chunk.least_significant_bits)  # e.g. ["00", "10", ...]
-        binary_data_split_up = list(map(lambda b: int(b, 2), lsb_bits))  # e.g. [0, 2, ...]
+        binary_data_split_up = self._split_into_lsb_values(chunk.data, chunk.least_significant_bits)  # e.g. [0, 2, ...]
         end_byte_index = len(binary_data_split_up) * nth + at_byte  # e.g. 32 on first iteration
 
         self.data[at_byte:end_byte_index:nth] = self._set_last_n_bits_in_array(
@@ -235,6 +244,21 @@ class WAVFile:
         )
         return end_byte_index
 
+    @staticmethod
+    def _split_into_lsb_values(data: bytes, n_bits: int) -> np.ndarray:
+        """ Split the bits of data into groups of n_bits and return the value of each group
+        E.g. b"\xac" = 0b10101100 with n_bits = 3 is split into 0b101, 0b011 and 0b00, so [5, 3, 0] is returned.
+        The last group only contains the remaining bits if the number of bits is not divisible by n_bits.
+        """
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8)).astype(np.int64)
+        full_group_count, remainder = divmod(len(bits), n_bits)
+        full_group_bits = bits[:full_group_count * n_bits].reshape(-1, n_bits)
+        remaining_bits = bits[full_group_count * n_bits:]
+        values = full_group_bits @ (1 << np.arange(n_bits - 1, -1, -1))
+        if remainder > 0:
+            values = np.append(values, remaining_bits @ (1 << np.arange(remainder - 1, -1, -1)))
+        return values
+
     @staticmethod
     def _set_last_n_bits_in_array(data_slice: np.ndarray, binary_data_split_up, n_bits_to_set: int):
         """ Set n bits in data_bits to 0, then set them equal to message_bits
@@ -276,9 +300,9 @@ class WAVFile:
         bits_to_format = (np.log2(ones + 1)).astype(int)
         bits_as_str = ''.join(f"{data:0{format_bits}b}" for data, format_bits in zip(relevant_bits, bits_to_format))
 
-        # Wrap the string every 8 bits and cast each to an integer, which is then converted to bytes
-        message_wrapped_as_bytes = bytes(map(lambda b: int(b, 2), textwrap.wrap(bits_as_str, 8)))
-        return to_amplitude, message_wrapped_as_bytes
+        # Parse the string of bits as a single integer and convert it to bytes at once (bits is a multiple of 8)
+        message_as_bytes = int(bits_as_str or "0", 2).to_bytes(bits // 8, "big")
+        return to_amplitude, message_as_bytes
 
     def _get_message(self, error_correction):
         """ Decode message from this WAVFile """